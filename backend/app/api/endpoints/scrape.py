@@ -2,84 +2,152 @@
 API endpoint for web scraping functionality.
 """
 
+import asyncio
+import hashlib
 import os
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from typing import Dict, Any, Optional
 
-from app.models import ScrapeRequest, ScrapeResponse, ErrorResponse
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+
+from app.models import (
+    BatchScrapeRequest,
+    BatchScrapeResponse,
+    ErrorResponse,
+    ScrapeRequest,
+    ScrapeResponse,
+)
 from app.services.scraper_service import ScraperService
+from app.services.llm_batcher import LLMBatcher
 from app.services.llm_service import LLMService
 from app.services.output_service import OutputService
+from app.utils.config import settings
 from app.utils.logger import logger
 
 router = APIRouter()
 
-# Service instances
+# Media types for generated output files, keyed by extension
+MEDIA_TYPES = {
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.pdf': 'application/pdf',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.txt': 'text/plain'
+}
+
+# Shared service singletons; status.py reuses llm_service and main.py
+# exposes all three on app.state, so per-instance caches and pools are
+# not duplicated across router modules
 scraper_service = ScraperService()
 llm_service = LLMService()
 output_service = OutputService()
 
+# Recently served scrape ETags; a client revalidating within the TTL
+# gets a bodyless 304 instead of a re-run
+_served_etags: TTLCache = TTLCache(maxsize=256, ttl=60)
+
+
+def _scrape_etag(request: ScrapeRequest) -> str:
+    """Strong ETag identifying a (url, prompt, output_format) request."""
+    key = f"{request.url}|{request.prompt}|{request.output_format}".encode("utf-8")
+    return f'"{hashlib.sha256(key).hexdigest()[:16]}"'
+
+
+# Coalesces concurrent LLM calls; resolves llm_service late so the
+# batcher always delegates to the current service instance
+llm_batcher = LLMBatcher(
+    lambda content, prompt, **kwargs: llm_service.process_content(content, prompt, **kwargs),
+    max_batch_size=settings.llm_batch_size,
+    max_queue_time=settings.llm_batch_window
+)
+
+
+async def _run_scrape(request: ScrapeRequest) -> ScrapeResponse:
+    """
+    Run the full scrape pipeline for one request.
+
+    Args:
+        request: Scraping request containing URL, prompt, and output format
+
+    Returns:
+        Scraping response with processed data and download link
+
+    Raises:
+        HTTPException: For invalid URLs or unreadable pages
+    """
+    # Validate URL
+    if not scraper_service.validate_url(str(request.url)):
+        logger.warning(f"Invalid URL provided: {request.url}")
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid URL. Please provide a valid HTTP/HTTPS URL."
+        )
+
+    # Fetch web content
+    logger.info(f"Starting scrape for URL: {request.url}")
+    cleaned_content = await scraper_service.fetch_content(str(request.url))
+
+    if not cleaned_content.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="No readable content found on the webpage."
+        )
+
+    # Process content with LLM (coalesced with concurrent requests)
+    logger.info("Processing content with LLM")
+    processed_data = await llm_batcher.process(cleaned_content, request.prompt)
+
+    # Generate output file
+    logger.info(f"Generating {request.output_format} output")
+    filename, filepath = await output_service.generate_output(
+        processed_data,
+        request.output_format,
+        request.prompt
+    )
+
+    logger.info(f"Scraping completed successfully. Generated file: {filename}")
+
+    # Server-generated data doesn't need response-side validation
+    return ScrapeResponse.model_construct(
+        success=True,
+        message="Scraping completed successfully",
+        data=processed_data,
+        download_url=f"/download/{filename}",
+        filename=filename
+    )
+
 
 @router.post("/scrape", response_model=ScrapeResponse)
 async def scrape_webpage(
     request: ScrapeRequest,
-    background_tasks: BackgroundTasks
-) -> ScrapeResponse:
+    if_none_match: Optional[str] = Header(None)
+) -> ORJSONResponse:
     """
     Scrape a webpage and process the content using LLM.
-    
+
     Args:
         request: Scraping request containing URL, prompt, and output format
-        background_tasks: FastAPI background tasks for cleanup
-        
+        if_none_match: Optional client ETag for conditional requests
+
     Returns:
-        Scraping response with processed data and download link
+        Scraping response with processed data and download link, or 304
+        if the client revalidated a recently served identical request
     """
+    etag = _scrape_etag(request)
+    if if_none_match == etag and etag in _served_etags:
+        return Response(status_code=304, headers={"ETag": etag})
+
     try:
-        # Validate URL
-        if not scraper_service.validate_url(str(request.url)):
-            logger.warning(f"Invalid URL provided: {request.url}")
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid URL. Please provide a valid HTTP/HTTPS URL."
-            )
-        
-        # Fetch web content
-        logger.info(f"Starting scrape for URL: {request.url}")
-        raw_html, cleaned_content = await scraper_service.fetch_content(str(request.url))
-        
-        if not cleaned_content.strip():
-            raise HTTPException(
-                status_code=400,
-                detail="No readable content found on the webpage."
-            )
-        
-        # Process content with LLM
-        logger.info("Processing content with LLM")
-        processed_data = await llm_service.process_content(cleaned_content, request.prompt)
-        
-        # Generate output file
-        logger.info(f"Generating {request.output_format} output")
-        filename, filepath = await output_service.generate_output(
-            processed_data,
-            request.output_format,
-            request.prompt
+        # Returning the response directly bypasses FastAPI's encoder and
+        # output validation for this hot path
+        result = await _run_scrape(request)
+        _served_etags[etag] = True
+        return ORJSONResponse(
+            result.model_dump(),
+            headers={"ETag": etag, "Cache-Control": "private, max-age=60"}
         )
-        
-        # Schedule cleanup of old files
-        background_tasks.add_task(output_service.cleanup_old_files)
-        
-        logger.info(f"Scraping completed successfully. Generated file: {filename}")
-        
-        return ScrapeResponse(
-            success=True,
-            message="Scraping completed successfully",
-            data=processed_data,
-            download_url=f"/download/{filename}",
-            filename=filename
-        )
-        
+
     except HTTPException:
         raise
     except Exception as e:
@@ -90,42 +158,125 @@ async def scrape_webpage(
         )
 
 
+@router.post("/scrape/batch", response_model=BatchScrapeResponse)
+async def scrape_webpages_batch(request: BatchScrapeRequest) -> ORJSONResponse:
+    """
+    Scrape several webpages concurrently in one round-trip.
+
+    The requests run under a semaphore so one batch cannot monopolize
+    the server; failures are reported per item rather than failing the
+    whole batch.
+
+    Args:
+        request: Batch of scraping requests (at most 20)
+
+    Returns:
+        Per-request results, in request order
+    """
+    semaphore = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def run_one(item: ScrapeRequest) -> ScrapeResponse:
+        async with semaphore:
+            try:
+                return await _run_scrape(item)
+            except HTTPException as e:
+                return ScrapeResponse.model_construct(success=False, message=e.detail)
+            except Exception as e:
+                logger.error(f"Batch scrape item failed: {str(e)}")
+                return ScrapeResponse.model_construct(
+                    success=False,
+                    message=f"Scraping failed: {str(e)}"
+                )
+
+    results = await asyncio.gather(*(run_one(item) for item in request.requests))
+    return ORJSONResponse({"results": [result.model_dump() for result in results]})
+
+
+@router.post("/scrape/stream")
+async def scrape_webpage_stream(request: ScrapeRequest) -> StreamingResponse:
+    """
+    Scrape a webpage and stream the LLM output as Server-Sent Events.
+
+    Tokens are forwarded to the client as the model produces them, so
+    perceived latency is time-to-first-token rather than the full
+    generation time. Callers that need the generated file should use
+    the blocking /scrape endpoint.
+
+    Args:
+        request: Scraping request containing URL, prompt, and output format
+
+    Returns:
+        text/event-stream response with incremental data frames
+    """
+    if not scraper_service.validate_url(str(request.url)):
+        logger.warning(f"Invalid URL provided: {request.url}")
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid URL. Please provide a valid HTTP/HTTPS URL."
+        )
+
+    logger.info(f"Starting streaming scrape for URL: {request.url}")
+    cleaned_content = await scraper_service.fetch_content(str(request.url))
+
+    if not cleaned_content.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="No readable content found on the webpage."
+        )
+
+    async def event_stream():
+        try:
+            async for delta in llm_service.stream_content(cleaned_content, request.prompt):
+                yield f"data: {orjson.dumps({'delta': delta}).decode()}\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            # The status line is already sent; report the failure in-band
+            logger.error(f"Streaming scrape failed: {str(e)}")
+            yield f"data: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/download/{filename}")
-async def download_file(filename: str):
+async def download_file(filename: str, request: Request):
     """
     Download a generated output file.
-    
+
     Args:
         filename: Name of the file to download
-        
+        request: Incoming request (used for conditional-request headers)
+
     Returns:
-        File response for download
+        File response for download, or 304 if the client's copy is current
     """
     try:
         filepath = output_service.output_dir / filename
-        
+
         if not filepath.exists():
             logger.warning(f"Requested file not found: {filename}")
             raise HTTPException(status_code=404, detail="File not found")
-        
-        # Determine media type based on file extension
-        media_type_map = {
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.pdf': 'application/pdf',
-            '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            '.txt': 'text/plain'
-        }
-        
-        file_extension = filepath.suffix.lower()
-        media_type = media_type_map.get(file_extension, 'application/octet-stream')
-        
+
+        # Stat once; the result feeds the ETag and the FileResponse headers
+        stat_result = filepath.stat()
+        etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        media_type = MEDIA_TYPES.get(filepath.suffix.lower(), 'application/octet-stream')
+
         logger.info(f"Serving file for download: {filename}")
         return FileResponse(
             path=str(filepath),
             filename=filename,
-            media_type=media_type
+            media_type=media_type,
+            stat_result=stat_result,
+            headers={
+                "ETag": etag,
+                "Cache-Control": "private, max-age=300"
+            }
         )
-        
+
     except HTTPException:
         raise
     except Exception as e:
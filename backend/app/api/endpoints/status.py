@@ -4,15 +4,12 @@ API endpoint for status checking.
 
 from fastapi import APIRouter, HTTPException
 from app.models import StatusResponse
-from app.services.llm_service import LLMService
+from app.api.endpoints.scrape import llm_service
 from app.utils.config import settings
 from app.utils.logger import logger
 
 router = APIRouter()
 
-# Service instances
-llm_service = LLMService()
-
 
 @router.get("/status", response_model=StatusResponse)
 async def get_status() -> StatusResponse:
@@ -34,6 +31,7 @@ async def get_status() -> StatusResponse:
             status="healthy",
             llm_provider=settings.llm_provider,
             llm_available=llm_available,
+            llm_cache=llm_service.cache.stats,
             version="1.0.0"
         )
         
@@ -2,19 +2,30 @@
 Main FastAPI application entry point.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import os
 
 from app.api.endpoints import scrape, status
+from app.services.llm_service import close_http_client
 from app.utils.config import settings
 from app.utils.logger import logger
 from app.models import ErrorResponse
 
 
+async def _periodic_cleanup():
+    """Remove old output files on a fixed interval."""
+    while True:
+        await asyncio.sleep(settings.cleanup_interval)
+        await asyncio.to_thread(scrape.output_service.cleanup_old_files)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
@@ -22,10 +33,33 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AI Web Scraper API")
     logger.info(f"LLM Provider: {settings.llm_provider}")
     logger.info(f"Debug mode: {settings.debug}")
-    
+
+    # Document generation runs via asyncio.to_thread; cap the default
+    # executor so heavy builds can't spawn unbounded threads
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+    )
+
+    # Expose the shared service singletons for anything that works from
+    # app.state rather than the endpoint modules
+    app.state.scraper_service = scrape.scraper_service
+    app.state.llm_service = scrape.llm_service
+    app.state.output_service = scrape.output_service
+
+    scrape.llm_batcher.start()
+    cleanup_task = asyncio.create_task(_periodic_cleanup())
+
     yield
-    
+
     # Shutdown
+    cleanup_task.cancel()
+    try:
+        await cleanup_task
+    except asyncio.CancelledError:
+        pass
+    await scrape.llm_batcher.stop()
+    await scrape.scraper_service.aclose()
+    await close_http_client()
     logger.info("Shutting down AI Web Scraper API")
 
 # Create FastAPI application
@@ -35,7 +69,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -47,6 +82,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads; small responses and file downloads
+# (client doesn't advertise gzip, or already-compressed formats) are
+# left alone
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Include routers
 app.include_router(scrape.router, prefix="/api", tags=["scraping"])
 app.include_router(status.router, prefix="/api", tags=["status"])
@@ -74,9 +114,9 @@ async def root():
 async def http_exception_handler(request, exc: HTTPException):
     """Custom HTTP exception handler."""
     logger.error(f"HTTP {exc.status_code}: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
+        content=ErrorResponse.model_construct(
             error="HTTP_ERROR",
             message=exc.detail
         ).model_dump()
@@ -87,8 +127,9 @@ async def http_exception_handler(request, exc: HTTPException):
 async def general_exception_handler(request, exc: Exception):
     """General exception handler for unhandled exceptions."""
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
-        status_code=500,        content=ErrorResponse(
+    return ORJSONResponse(
+        status_code=500,
+        content=ErrorResponse.model_construct(
             error="INTERNAL_ERROR",
             message="An internal server error occurred"
         ).model_dump()
@@ -97,11 +138,25 @@ async def general_exception_handler(request, exc: Exception):
 
 if __name__ == "__main__":
     import uvicorn
-    
-    uvicorn.run(
-        "main:app",
-        host=settings.api_host,
-        port=settings.api_port,
-        reload=settings.debug,
-        log_level="info"
-    )
+
+    if settings.debug:
+        uvicorn.run(
+            "main:app",
+            host=settings.api_host,
+            port=settings.api_port,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # uvloop + httptools give markedly higher throughput for this
+        # I/O-bound workload; multiple workers raise the concurrency
+        # ceiling (reload and workers are mutually exclusive in uvicorn)
+        uvicorn.run(
+            "main:app",
+            host=settings.api_host,
+            port=settings.api_port,
+            loop="uvloop",
+            http="httptools",
+            workers=max(2, os.cpu_count() or 2),
+            log_level="info"
+        )
@@ -2,7 +2,7 @@
 Pydantic models for request/response validation.
 """
 
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, HttpUrl, Field
 
 
@@ -32,12 +32,33 @@ class ScrapeResponse(BaseModel):
     filename: Optional[str] = Field(None, description="Generated filename")
 
 
+class BatchScrapeRequest(BaseModel):
+    """Request model for the batch scraping endpoint."""
+
+    requests: List[ScrapeRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=20,
+        description="Scrape requests to run concurrently"
+    )
+
+
+class BatchScrapeResponse(BaseModel):
+    """Response model for the batch scraping endpoint."""
+
+    results: List[ScrapeResponse] = Field(
+        ...,
+        description="Per-request results, in request order"
+    )
+
+
 class StatusResponse(BaseModel):
     """Response model for status endpoint."""
     
     status: str = Field(..., description="API status")
     llm_provider: str = Field(..., description="Current LLM provider")
     llm_available: bool = Field(..., description="Whether LLM service is available")
+    llm_cache: Optional[dict] = Field(None, description="LLM response cache statistics")
     version: str = Field(default="1.0.0", description="API version")
 
 
@@ -0,0 +1,185 @@
+"""
+Micro-batching layer for LLM requests.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.config import settings
+from app.utils.logger import logger
+
+# (content, prompt, future awaiting the per-item result)
+_QueueItem = Tuple[str, str, "asyncio.Future[Dict[str, Any]]"]
+
+_BATCH_INSTRUCTIONS = (
+    "You will be given several independent extraction tasks, each with its "
+    "own instructions and web content. Process every task separately and "
+    "return a single JSON object mapping the task number (as a string) to "
+    "that task's result, e.g. {\"1\": {...}, \"2\": {...}}."
+)
+
+
+class LLMBatcher:
+    """Coalesces concurrent LLM requests into batched provider calls.
+
+    Requests arriving within a short collection window are combined into
+    a single numbered prompt, amortizing the per-call TLS and
+    time-to-first-token overhead across the batch. A lone request in the
+    window is forwarded unchanged, so batching never alters
+    single-request semantics.
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[..., Awaitable[Dict[str, Any]]],
+        max_batch_size: int = 8,
+        max_queue_time: float = 0.025,
+        concurrency: int = 4
+    ):
+        self._process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._queue: "asyncio.Queue[_QueueItem]" = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._carry: Optional[_QueueItem] = None
+        self._dispatch_tasks: set = set()
+
+    def start(self) -> None:
+        """Start the background collection loop if not already running.
+
+        The worker is rebound if the current event loop differs from the
+        one it was created on (e.g. across test event loops), since a task
+        parked on a dead loop would otherwise consume nothing while
+        appearing alive.
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._carry = None
+        self._worker = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the collection loop (called on application shutdown)."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def process(self, content: str, prompt: str) -> Dict[str, Any]:
+        """
+        Submit one request for (possibly batched) LLM processing.
+
+        Args:
+            content: Cleaned web content to process
+            prompt: User instructions for data extraction
+
+        Returns:
+            Processed data for this request only
+        """
+        self.start()
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((content, prompt, future))
+        return await future
+
+    @staticmethod
+    def _item_size(item: _QueueItem) -> int:
+        """Approximate prompt-assembly size of one queued request."""
+        content, prompt, _ = item
+        return len(content) + len(prompt) + 100  # headers/framing slack
+
+    async def _run(self) -> None:
+        """Collect queued requests into batches and dispatch them.
+
+        A batch is flushed when it reaches max_batch_size, when the
+        collection window expires, or when adding the next item would
+        push the combined content past the provider truncation limit
+        (which would silently drop later tasks from the prompt).
+        """
+        loop = asyncio.get_running_loop()
+        size_budget = settings.max_content_length
+        while True:
+            first = self._carry if self._carry is not None else await self._queue.get()
+            self._carry = None
+            batch: List[_QueueItem] = [first]
+            combined_size = self._item_size(first)
+            deadline = loop.time() + self.max_queue_time
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if combined_size + self._item_size(item) > size_budget:
+                    # Would overflow the provider content limit; start the
+                    # next batch with this item instead
+                    self._carry = item
+                    break
+                batch.append(item)
+                combined_size += self._item_size(item)
+            # Dispatch in the background so a slow batch doesn't stall
+            # collection of the next one
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: List[_QueueItem]) -> None:
+        """Run one batch through the LLM and resolve each waiter."""
+        async with self._semaphore:
+            if len(batch) == 1:
+                content, prompt, future = batch[0]
+                try:
+                    result = await self._process_fn(content, prompt)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                return
+
+            logger.info(f"Dispatching batched LLM call with {len(batch)} tasks")
+            sections = []
+            for i, (content, prompt, _) in enumerate(batch, 1):
+                sections.append(
+                    f"Task {i} instructions: {prompt}\n"
+                    f"Task {i} content:\n{content}"
+                )
+            combined_content = "\n\n".join(sections)
+
+            try:
+                # Scale the completion budget with the batch so later tasks
+                # aren't squeezed out of a single-request token allowance
+                result = await self._process_fn(
+                    combined_content,
+                    _BATCH_INSTRUCTIONS,
+                    max_tokens=min(2000 * len(batch), 4000)
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for i, (_, _, future) in enumerate(batch, 1):
+                if future.done():
+                    continue
+                if isinstance(result, dict) and str(i) in result:
+                    future.set_result(result[str(i)])
+                else:
+                    # Model didn't honour the numbered structure; failing
+                    # this waiter is safer than handing it the combined
+                    # response, which contains other requests' data
+                    future.set_exception(
+                        Exception(f"Batched LLM response missing result for task {i}")
+                    )
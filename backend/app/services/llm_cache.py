@@ -0,0 +1,121 @@
+"""
+Caching layer for LLM responses.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional, Protocol
+
+from cachetools import TTLCache
+
+from app.utils.logger import logger
+
+
+class CacheBackend(Protocol):
+    """Protocol for cache backends used by LLMCache."""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None if absent/expired."""
+        ...
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a value under key."""
+        ...
+
+    async def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        ...
+
+
+class InMemoryCacheBackend:
+    """In-memory LRU cache backend with per-entry TTL."""
+
+    def __init__(self, maxsize: int = 256, ttl: int = 3600):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._cache[key] = value
+
+    async def delete(self, key: str) -> None:
+        self._cache.pop(key, None)
+
+
+class RedisCacheBackend:
+    """Redis-backed cache backend for multi-worker deployments.
+
+    Requires the optional `redis` package (redis.asyncio).
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: int = 3600):
+        # Imported lazily so redis stays an optional dependency
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._ttl = ttl
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self._client.get(key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        await self._client.set(key, json.dumps(value), ex=self._ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+
+class LLMCache:
+    """Cache for LLM responses keyed by the full request parameters.
+
+    Responses are only cached for the deterministic low-temperature
+    requests this application issues, so a hit can be returned verbatim
+    without another round-trip to the provider.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: int = 3600):
+        self.backend: CacheBackend = backend if backend is not None else InMemoryCacheBackend(ttl=ttl)
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, content: str) -> str:
+        """
+        Build a deterministic cache key for an LLM request.
+
+        Args:
+            provider: LLM provider name
+            model: Model identifier
+            prompt: User extraction prompt
+            content: Web content (already truncated to the request limit)
+
+        Returns:
+            SHA-256 hex digest of the canonical request parameters
+        """
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "prompt": prompt,
+                "content": content,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response, updating hit/miss statistics."""
+        result = await self.backend.get(key)
+        if result is not None:
+            self.stats["hits"] += 1
+            logger.info("LLM cache hit")
+        else:
+            self.stats["misses"] += 1
+        return result
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response in the cache."""
+        await self.backend.set(key, value)
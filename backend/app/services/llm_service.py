@@ -2,158 +2,345 @@
 LLM service for processing web content with AI models.
 """
 
-import json
+import time
+
+import orjson
 from typing import Dict, Any, Optional
 import httpx
+from app.services.llm_cache import LLMCache, RedisCacheBackend
 from app.utils.config import settings
 from app.utils.logger import logger
 
+# Shared HTTP client so LLM calls reuse pooled keep-alive connections
+# instead of paying a TCP+TLS handshake per request.
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Shared TLS context; building one loads the CA bundle from disk, which
+# is worth paying exactly once per process.
+_ssl_context = None
+
+
+def get_ssl_context():
+    """Return the shared SSLContext, building it on first use."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = httpx.create_ssl_context(verify=True)
+    return _ssl_context
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=settings.request_timeout,
+            verify=get_ssl_context(),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50
+            )
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
 
 class LLMService:
     """Service for interacting with Large Language Models."""
-    
-    def __init__(self):
+
+    # How long a check_availability result stays fresh before the
+    # provider is probed again
+    _CHECK_TTL = 30.0
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.timeout = settings.request_timeout
         self.provider = settings.llm_provider
-        
-    async def process_content(self, content: str, prompt: str) -> Dict[str, Any]:
+        if settings.llm_cache_backend == "redis":
+            cache_backend = RedisCacheBackend(settings.redis_url, ttl=settings.llm_cache_ttl)
+        else:
+            cache_backend = None  # LLMCache falls back to the in-memory backend
+        self.cache = LLMCache(backend=cache_backend, ttl=settings.llm_cache_ttl)
+        self._client = client
+        self._last_check = 0.0
+        self._last_result = False
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for provider API calls."""
+        return self._client if self._client is not None else get_http_client()
+
+    @property
+    def model(self) -> str:
+        """Model identifier for the configured provider."""
+        if self.provider == "openrouter":
+            return settings.openrouter_model
+        return "gpt-3.5-turbo"
+
+    async def process_content(
+        self,
+        content: str,
+        prompt: str,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Process web content using LLM based on user prompt.
-        
+
         Args:
             content: Raw web content to process
             prompt: User instructions for data extraction
-            
+            max_tokens: Optional completion budget override (used by the
+                request batcher to scale output with batch size)
+
         Returns:
             Processed data as dictionary
-            
+
         Raises:
             Exception: If LLM processing fails
         """
         try:
+            # Responses are deterministic enough (temperature 0.1) to cache
+            cache_key = LLMCache.make_key(
+                self.provider,
+                self.model,
+                prompt,
+                content[:settings.max_content_length]
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             if self.provider == "openai":
-                return await self._process_with_openai(content, prompt)
+                result = await self._process_with_openai(content, prompt, max_tokens)
             elif self.provider == "openrouter":
-                return await self._process_with_openrouter(content, prompt)
+                result = await self._process_with_openrouter(content, prompt, max_tokens)
             else:
                 raise ValueError(f"Unsupported LLM provider: {self.provider}")
-                
+
+            await self.cache.set(cache_key, result)
+            return result
+
         except Exception as e:
             logger.error(f"LLM processing failed: {str(e)}")
             raise
     
-    async def _process_with_openai(self, content: str, prompt: str) -> Dict[str, Any]:
-        """Process content using OpenAI API."""
+    SYSTEM_PROMPT = (
+        "You are an expert web scraper. Extract data from the provided web "
+        "content according to the user's instructions. Return the result as "
+        "a JSON object with clear structure. If you cannot extract the "
+        "requested data, return an empty result with an explanation."
+    )
+
+    def _truncate_content(self, content: str) -> str:
+        """Truncate content to the configured limit, once, at a word boundary."""
+        limit = settings.max_content_length
+        if len(content) <= limit:
+            return content
+        truncated = content[:limit]
+        # Back off to the last whitespace so the model doesn't receive a
+        # mid-word fragment at the cut point
+        cut = truncated.rfind(' ')
+        if cut > limit // 2:
+            truncated = truncated[:cut]
+        logger.warning(f"Content truncated to {len(truncated)} characters for LLM prompt")
+        return truncated
+
+    def _build_messages(self, content: str, prompt: str) -> list:
+        """Assemble the chat messages shared by both providers."""
+        user_message = (
+            f"User Instructions: {prompt}\n\n"
+            f"Web Content:\n{self._truncate_content(content)}\n\n"
+            "Please extract the requested data and return it as a structured JSON object."
+        )
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": user_message}
+        ]
+
+    def _provider_config(self) -> tuple:
+        """Resolve (base_url, model, api_key, extra_headers) for the provider."""
+        if self.provider == "openrouter":
+            if not settings.openrouter_api_key:
+                raise ValueError("OpenRouter API key not configured")
+            return (
+                "https://openrouter.ai/api/v1",
+                settings.openrouter_model,
+                settings.openrouter_api_key,
+                {
+                    "HTTP-Referer": "http://localhost:8000",
+                    "X-Title": "AI Web Scraper"
+                }
+            )
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key not configured")
-        
-        system_prompt = """You are an expert web scraper. Extract data from the provided web content according to the user's instructions. Return the result as a JSON object with clear structure. If you cannot extract the requested data, return an empty result with an explanation."""
-        
-        user_message = f"""
-        User Instructions: {prompt}
-        
-        Web Content:
-        {content[:settings.max_content_length]}
-        
-        Please extract the requested data and return it as a structured JSON object.
+        return ("https://api.openai.com/v1", "gpt-3.5-turbo", settings.openai_api_key, {})
+
+    async def stream_content(self, content: str, prompt: str):
         """
-        
+        Stream LLM output for web content as it is generated.
+
+        Args:
+            content: Raw web content to process
+            prompt: User instructions for data extraction
+
+        Yields:
+            Text deltas from the model response
+        """
+        base_url, model, api_key, extra_headers = self._provider_config()
+
         payload = {
-            "model": "gpt-3.5-turbo",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
+            "model": model,
+            "messages": self._build_messages(content, prompt),
             "temperature": 0.1,
-            "max_tokens": 2000
+            "max_tokens": 2000,
+            "stream": True
         }
-        
+
         headers = {
-            "Authorization": f"Bearer {settings.openai_api_key}",
-            "Content-Type": "application/json"
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            **extra_headers
         }
-        
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                json=payload,
-                headers=headers
-            )
+
+        async with self.client.stream(
+            "POST",
+            f"{base_url}/chat/completions",
+            json=payload,
+            headers=headers
+        ) as response:
             response.raise_for_status()
-            
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
-            
-            # Try to parse as JSON, fallback to text structure
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                return {"extracted_text": content}
-    
-    async def _process_with_openrouter(self, content: str, prompt: str) -> Dict[str, Any]:
-        """Process content using OpenRouter API."""
-        if not settings.openrouter_api_key:
-            raise ValueError("OpenRouter API key not configured")
-        
-        system_prompt = """You are an expert web scraper. Extract data from the provided web content according to the user's instructions. Return the result as a JSON object with clear structure. If you cannot extract the requested data, return an empty result with an explanation."""
-        
-        user_message = f"""
-        User Instructions: {prompt}
-        
-        Web Content:
-        {content[:settings.max_content_length]}
-        
-        Please extract the requested data and return it as a structured JSON object.
-        """
-        
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                chunk = orjson.loads(data)
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
+    async def _post_chat(
+        self,
+        base_url: str,
+        model: str,
+        api_key: str,
+        extra_headers: Dict[str, str],
+        content: str,
+        prompt: str,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Issue a chat-completions request and parse the model output."""
         payload = {
-            "model": settings.openrouter_model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
+            "model": model,
+            "messages": self._build_messages(content, prompt),
             "temperature": 0.1,
-            "max_tokens": 2000
+            "max_tokens": max_tokens or 2000
         }
-        
+
         headers = {
-            "Authorization": f"Bearer {settings.openrouter_api_key}",
+            "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:8000",
-            "X-Title": "AI Web Scraper"
+            **extra_headers
         }
-        
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                json=payload,
-                headers=headers
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
-            
-            # Try to parse as JSON, fallback to text structure
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                return {"extracted_text": content}
-    
+
+        response = await self.client.post(
+            f"{base_url}/chat/completions",
+            json=payload,
+            headers=headers
+        )
+        response.raise_for_status()
+
+        result = orjson.loads(response.content)
+        content = result["choices"][0]["message"]["content"]
+
+        # Try to parse as JSON, fallback to text structure
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return {"extracted_text": content}
+
+    async def _process_with_openai(
+        self,
+        content: str,
+        prompt: str,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Process content using OpenAI API."""
+        if not settings.openai_api_key:
+            raise ValueError("OpenAI API key not configured")
+
+        return await self._post_chat(
+            "https://api.openai.com/v1",
+            "gpt-3.5-turbo",
+            settings.openai_api_key,
+            {},
+            content,
+            prompt,
+            max_tokens
+        )
+
+    async def _process_with_openrouter(
+        self,
+        content: str,
+        prompt: str,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Process content using OpenRouter API."""
+        if not settings.openrouter_api_key:
+            raise ValueError("OpenRouter API key not configured")
+
+        return await self._post_chat(
+            "https://openrouter.ai/api/v1",
+            settings.openrouter_model,
+            settings.openrouter_api_key,
+            {
+                "HTTP-Referer": "http://localhost:8000",
+                "X-Title": "AI Web Scraper"
+            },
+            content,
+            prompt,
+            max_tokens
+        )
+
     async def check_availability(self) -> bool:
         """
         Check if the LLM service is available.
-        
+
+        Issues a cheap authenticated GET against the provider's /models
+        endpoint instead of a full chat completion, and caches the result
+        so repeated health checks don't hammer the provider.
+
         Returns:
             True if service is available, False otherwise
         """
+        if time.monotonic() - self._last_check < self._CHECK_TTL:
+            return self._last_result
+
         try:
-            # Simple test with minimal content
-            test_result = await self.process_content(
-                "Test content",
-                "Return 'test successful' if you can process this."
+            if self.provider == "openrouter":
+                base_url = "https://openrouter.ai/api/v1"
+                api_key = settings.openrouter_api_key
+            else:
+                base_url = "https://api.openai.com/v1"
+                api_key = settings.openai_api_key
+
+            response = await self.client.get(
+                f"{base_url}/models",
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=5.0
             )
-            return isinstance(test_result, dict)
+            result = response.status_code < 500
         except Exception as e:
             logger.warning(f"LLM service unavailable: {str(e)}")
-            return False
+            result = False
+
+        self._last_check = time.monotonic()
+        self._last_result = result
+        return result
@@ -2,28 +2,85 @@
 Output service for generating files in various formats.
 """
 
-import json
+import asyncio
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+import pandas as pd
 from docx import Document
 from docx.shared import Inches
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+import xlsxwriter
 
-from app.utils.logger import logger
+from app.utils.logger import logger, setup_worker_logger
+
+# Skip reportlab's per-attribute shape validation; the document
+# structure we emit is fixed and known-good
+rl_config.shapeChecking = 0
+
+# Table styling is identical for every PDF, so build the command list
+# (and the TableStyle in _TABLE_STYLE) exactly once
+_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+# Indent prefixes for the Word/text/PDF formatters, precomputed so deep
+# payloads don't re-multiply strings per line
+_INDENT_SPACES = tuple('  ' * i for i in range(64))
+_INDENT_NBSP = tuple('&nbsp;' * (i * 4) for i in range(64))
+
+# Large tabular builds are pure CPU and GIL-bound; beyond this many rows
+# the build moves to a worker process so independent reports can use
+# separate cores (workers are only spawned on first use). Workers get a
+# direct log handler, since the parent's queue listener can't drain
+# records enqueued in a child process.
+_PROCESS_POOL_ROW_THRESHOLD = 200
+_PROCESS_POOL = ProcessPoolExecutor(
+    max_workers=max(2, (os.cpu_count() or 2) // 2),
+    initializer=setup_worker_logger
+)
 
 
 class OutputService:
     """Service for generating output files in various formats."""
-    
+
+    # Format dispatch: one hash lookup instead of an if/elif chain, and
+    # the single place to register new formats
+    _HANDLERS = {
+        'word': '_generate_word',
+        'pdf': '_generate_pdf',
+        'excel': '_generate_excel',
+        'text': '_generate_text',
+    }
+
+    # Built once on first PDF; stylesheet and ParagraphStyle
+    # construction are pure overhead to repeat per request
+    _styles = None
+    _title_style = None
+
+    @classmethod
+    def _get_styles(cls):
+        """Return the shared reportlab stylesheet, building it on first use."""
+        if cls._styles is None:
+            cls._styles = getSampleStyleSheet()
+        return cls._styles
+
     def __init__(self):
         self.output_dir = Path("outputs")
         self.output_dir.mkdir(exist_ok=True)
@@ -47,31 +104,37 @@ class OutputService:
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         unique_id = str(uuid.uuid4())[:8]
-        
+
         try:
-            if format_type == "word":
-                return await self._generate_word(data, prompt, timestamp, unique_id)
-            elif format_type == "pdf":
-                return await self._generate_pdf(data, prompt, timestamp, unique_id)
-            elif format_type == "excel":
-                return await self._generate_excel(data, prompt, timestamp, unique_id)
-            elif format_type == "text":
-                return await self._generate_text(data, prompt, timestamp, unique_id)
-            else:
+            method_name = self._HANDLERS.get(format_type)
+            if method_name is None:
                 raise ValueError(f"Unsupported format: {format_type}")
-                
+            return await getattr(self, method_name)(data, prompt, timestamp, unique_id)
+
         except Exception as e:
             logger.error(f"Error generating {format_type} output: {str(e)}")
             raise
     
     async def _generate_word(
-        self, 
-        data: Dict[str, Any], 
-        prompt: str, 
-        timestamp: str, 
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
         unique_id: str
     ) -> Tuple[str, str]:
-        """Generate Word document."""
+        """Generate Word document in a worker thread."""
+        return await asyncio.to_thread(
+            self._build_word_sync, data, prompt, timestamp, unique_id
+        )
+
+    def _build_word_sync(
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
+        unique_id: str
+    ) -> Tuple[str, str]:
+        """Build the Word document synchronously."""
         filename = f"scrape_result_{timestamp}_{unique_id}.docx"
         filepath = self.output_dir / filename
         
@@ -93,54 +156,71 @@ class OutputService:
             self._add_dict_to_word(doc, data)
         else:
             doc.add_paragraph(str(data))
-        
-        doc.save(str(filepath))
+
+        # Write to a temp name and replace atomically, so a crash
+        # mid-write never leaves a corrupt file at the served path
+        tmp = filepath.with_suffix(filepath.suffix + '.tmp')
+        with open(tmp, 'wb', buffering=1 << 20) as fh:
+            doc.save(fh)
+        os.replace(tmp, filepath)
         logger.info(f"Generated Word document: {filename}")
         return filename, str(filepath)
     
     def _add_dict_to_word(self, doc: Document, data: Dict[str, Any], level: int = 0):
         """Recursively add dictionary data to Word document."""
+        pad = _INDENT_SPACES[min(level, 63)]
         for key, value in data.items():
             if isinstance(value, dict):
                 if level == 0:
                     doc.add_heading(str(key).title(), level=2)
                 else:
-                    doc.add_paragraph(f"{'  ' * level}• {key}:", style='List Bullet')
+                    doc.add_paragraph(f"{pad}• {key}:", style='List Bullet')
                 self._add_dict_to_word(doc, value, level + 1)
             elif isinstance(value, list):
-                doc.add_paragraph(f"{'  ' * level}• {key}:", style='List Bullet')
+                doc.add_paragraph(f"{pad}• {key}:", style='List Bullet')
+                item_pad = _INDENT_SPACES[min(level + 1, 63)]
                 for item in value:
                     if isinstance(item, dict):
                         self._add_dict_to_word(doc, item, level + 1)
                     else:
-                        doc.add_paragraph(f"{'  ' * (level + 1)}- {item}")
+                        doc.add_paragraph(f"{item_pad}- {item}")
             else:
-                doc.add_paragraph(f"{'  ' * level}• {key}: {value}")
+                doc.add_paragraph(f"{pad}• {key}: {value}")
     
     async def _generate_pdf(
-        self, 
-        data: Dict[str, Any], 
-        prompt: str, 
-        timestamp: str, 
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
         unique_id: str
     ) -> Tuple[str, str]:
-        """Generate PDF document."""
+        """Generate PDF document in a worker thread or process."""
+        if self._estimated_rows(data) > _PROCESS_POOL_ROW_THRESHOLD:
+            return await asyncio.get_running_loop().run_in_executor(
+                _PROCESS_POOL, self._build_pdf_sync, data, prompt, timestamp, unique_id
+            )
+        return await asyncio.to_thread(
+            self._build_pdf_sync, data, prompt, timestamp, unique_id
+        )
+
+    def _build_pdf_sync(
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
+        unique_id: str
+    ) -> Tuple[str, str]:
+        """Build the PDF document synchronously."""
         filename = f"scrape_result_{timestamp}_{unique_id}.pdf"
         filepath = self.output_dir / filename
         
-        doc = SimpleDocTemplate(str(filepath), pagesize=letter)
-        styles = getSampleStyleSheet()
+        tmp = filepath.with_suffix(filepath.suffix + '.tmp')
+        doc = SimpleDocTemplate(str(tmp), pagesize=letter)
+        styles = self._get_styles()
         story = []
-        
+
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        story.append(Paragraph("Web Scraping Results", title_style))
+        story.append(Paragraph("Web Scraping Results", self._get_title_style(styles)))
         story.append(Spacer(1, 20))
         
         # Metadata
@@ -152,253 +232,326 @@ class OutputService:
         # Data
         story.append(Paragraph("Extracted Data", styles['Heading2']))
         
-        if isinstance(data, dict) and self._is_tabular_data(data):
-            # Create table for tabular data
-            table_data = self._dict_to_table_data(data)
-            if table_data:
-                table = Table(table_data)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(table)
+        table_data = self._extract_table_data(data)
+        if table_data is not None:
+            table = Table(table_data)
+            table.setStyle(_TABLE_STYLE)
+            story.append(table)
         else:
             # Add as formatted text
             formatted_text = self._format_data_for_pdf(data)
             story.append(Paragraph(formatted_text, styles['Normal']))
         
         doc.build(story)
+        os.replace(tmp, filepath)
         logger.info(f"Generated PDF document: {filename}")
         return filename, str(filepath)
     
-    def _is_tabular_data(self, data: Dict[str, Any]) -> bool:
-        """Check if data can be represented as a table."""
+    @classmethod
+    def _get_title_style(cls, styles) -> ParagraphStyle:
+        """Return the shared title style, building it on first use."""
+        if cls._title_style is None:
+            cls._title_style = ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=20,
+                spaceAfter=30,
+                alignment=1  # Center
+            )
+        return cls._title_style
+
+    def _estimated_rows(self, data: Any) -> int:
+        """Estimate the row count of the payload's main table, if any."""
         if not isinstance(data, dict):
-            return False
-        
-        # Look for list of dictionaries (common table format)
+            return 0
+        return max(
+            (len(value) for value in data.values() if isinstance(value, list)),
+            default=0
+        )
+
+    def _extract_table_data(self, data: Any) -> Optional[list]:
+        """
+        Find the first list-of-dicts value and convert it to table rows.
+
+        Detection and extraction happen in one pass, and the per-cell
+        stringification is pandas's vectorized cast rather than a Python
+        loop. Returns None when the payload has no tabular section.
+        """
+        if not isinstance(data, dict):
+            return None
+
         for value in data.values():
             if isinstance(value, list) and len(value) > 0:
                 if all(isinstance(item, dict) for item in value):
-                    return True
-        return False
+                    # Explicit columns keep the first row's key order
+                    # and skip pandas's column-union inference; object
+                    # dtype stops ragged int columns being upcast to
+                    # float (which would render 2 as "2.0")
+                    headers = list(value[0].keys())
+                    df = pd.DataFrame(value, columns=headers, dtype=object).fillna('')
+                    return [headers] + df.astype(str).values.tolist()
+        return None
     
-    def _dict_to_table_data(self, data: Dict[str, Any]) -> list:
-        """Convert dictionary data to table format."""
-        table_data = []
-        
-        # Find the first list of dictionaries
-        for key, value in data.items():
-            if isinstance(value, list) and len(value) > 0:
-                if all(isinstance(item, dict) for item in value):
-                    # Use this as table data
-                    if value:
-                        headers = list(value[0].keys())
-                        table_data.append(headers)
-                        for item in value:
-                            row = [str(item.get(header, '')) for header in headers]
-                            table_data.append(row)
-                    break
-        
-        return table_data
-    
-    def _format_data_for_pdf(self, data: Any, indent: int = 0) -> str:
-        """Format data for PDF display."""
-        if isinstance(data, dict):
-            result = []
-            for key, value in data.items():
-                if isinstance(value, (dict, list)):
-                    result.append(f"{'&nbsp;' * (indent * 4)}<b>{key}:</b><br/>")
-                    result.append(self._format_data_for_pdf(value, indent + 1))
-                else:
-                    result.append(f"{'&nbsp;' * (indent * 4)}<b>{key}:</b> {value}<br/>")
-            return ''.join(result)
-        elif isinstance(data, list):
-            result = []
-            for item in data:
-                result.append(f"{'&nbsp;' * (indent * 4)}• {self._format_data_for_pdf(item, indent + 1)}<br/>")
-            return ''.join(result)
-        else:
-            return str(data)
+    def _format_data_for_pdf(self, data: Any) -> str:
+        """
+        Format data for PDF display.
+
+        Walks the payload iteratively with an explicit stack and writes
+        into one StringIO, so deep structures cost O(N) bytes instead of
+        the O(N*depth) copying of the old per-level join.
+        """
+        buf = io.StringIO()
+        write = buf.write
+        # Stack holds literal fragments to emit or (node, indent) pairs;
+        # children are pushed in reverse so emission order is preserved
+        stack = [(data, 0)]
+
+        while stack:
+            frame = stack.pop()
+            if isinstance(frame, str):
+                write(frame)
+                continue
+
+            node, indent = frame
+            pad = _INDENT_NBSP[min(indent, 63)]
+            node_type = type(node)
+            if node_type is dict:
+                for key, value in reversed(node.items()):
+                    if isinstance(value, (dict, list)):
+                        stack.append((value, indent + 1))
+                        stack.append(f"{pad}<b>{key}:</b><br/>")
+                    else:
+                        stack.append(f"{pad}<b>{key}:</b> {value}<br/>")
+            elif node_type is list:
+                for item in reversed(node):
+                    stack.append("<br/>")
+                    stack.append((item, indent + 1))
+                    stack.append(f"{pad}\u2022 ")
+            else:
+                write(str(node))
+
+        return buf.getvalue()
     
     async def _generate_excel(
-        self, 
-        data: Dict[str, Any], 
-        prompt: str, 
-        timestamp: str, 
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
+        unique_id: str
+    ) -> Tuple[str, str]:
+        """Generate Excel file in a worker thread or process."""
+        if self._estimated_rows(data) > _PROCESS_POOL_ROW_THRESHOLD:
+            return await asyncio.get_running_loop().run_in_executor(
+                _PROCESS_POOL, self._build_excel_sync, data, prompt, timestamp, unique_id
+            )
+        return await asyncio.to_thread(
+            self._build_excel_sync, data, prompt, timestamp, unique_id
+        )
+
+    def _build_excel_sync(
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
         unique_id: str
     ) -> Tuple[str, str]:
-        """Generate Excel file."""
+        """Build the Excel file synchronously."""
         filename = f"scrape_result_{timestamp}_{unique_id}.xlsx"
         filepath = self.output_dir / filename
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Scraping Results"
-        
-        # Header styling
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        
+
+        # constant_memory streams each row to disk as it is written, so
+        # memory stays O(one row) no matter how large the table is
+        tmp = filepath.with_suffix(filepath.suffix + '.tmp')
+        wb = xlsxwriter.Workbook(
+            str(tmp),
+            {'constant_memory': True, 'in_memory': False}
+        )
+        ws = wb.add_worksheet("Scraping Results")
+
+        formats = {
+            'title': wb.add_format({'bold': True, 'font_size': 16}),
+            'header': wb.add_format({
+                'bold': True, 'font_color': 'white', 'bg_color': '#366092'
+            }),
+            'subheader': wb.add_format({'bold': True, 'bg_color': '#D9D9D9'}),
+        }
+
+        # Track the widest value per column during the single write pass;
+        # the old openpyxl version re-read every cell afterwards
+        col_widths: Dict[int, int] = {}
+
+        def write(row: int, col: int, value: Any, fmt=None):
+            ws.write(row, col, value, fmt)
+            width = len(str(value))
+            if width > col_widths.get(col, 0):
+                col_widths[col] = width
+
         # Add metadata
-        ws['A1'] = "Web Scraping Results"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws['A3'] = "Generated:"
-        ws['B3'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        ws['A4'] = "Prompt:"
-        ws['B4'] = prompt
-        
-        # Add data starting from row 6
-        current_row = 6
-        
+        write(0, 0, "Web Scraping Results", formats['title'])
+        write(2, 0, "Generated:")
+        write(2, 1, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        write(3, 0, "Prompt:")
+        write(3, 1, prompt)
+
+        # Add data starting from row 5 (0-based)
+        current_row = 5
+
         if isinstance(data, dict):
-            current_row = self._add_dict_to_excel(ws, data, current_row)
+            self._add_dict_to_excel(write, data, current_row, formats)
         else:
-            ws[f'A{current_row}'] = "Extracted Data"
-            ws[f'A{current_row}'].font = header_font
-            ws[f'A{current_row}'].fill = header_fill
-            current_row += 1
-            ws[f'A{current_row}'] = str(data)
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        wb.save(str(filepath))
+            write(current_row, 0, "Extracted Data", formats['header'])
+            write(current_row + 1, 0, str(data))
+
+        for col, width in col_widths.items():
+            ws.set_column(col, col, min(width + 2, 50))
+
+        wb.close()
+        os.replace(tmp, filepath)
         logger.info(f"Generated Excel file: {filename}")
         return filename, str(filepath)
-    
-    def _add_dict_to_excel(self, ws, data: Dict[str, Any], start_row: int) -> int:
-        """Add dictionary data to Excel worksheet."""
+
+    def _add_dict_to_excel(
+        self,
+        write,
+        data: Dict[str, Any],
+        start_row: int,
+        formats: Dict[str, Any]
+    ) -> int:
+        """Add dictionary data to the worksheet via the write callback."""
         current_row = start_row
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        
+
         for key, value in data.items():
             if isinstance(value, list) and len(value) > 0:
+                write(current_row, 0, key.title(), formats['header'])
+                current_row += 1
+
                 if all(isinstance(item, dict) for item in value):
-                    # Create table for list of dictionaries
-                    ws[f'A{current_row}'] = key.title()
-                    ws[f'A{current_row}'].font = header_font
-                    ws[f'A{current_row}'].fill = header_fill
+                    # Create table for list of dictionaries; the
+                    # DataFrame cast stringifies cells and fills missing
+                    # keys in C instead of per-cell Python calls
+                    headers = list(value[0].keys())
+                    df = pd.DataFrame(value, columns=headers, dtype=object)
+                    df = df.fillna('').astype(str)
+                    for col, header in enumerate(headers):
+                        write(current_row, col, header, formats['subheader'])
                     current_row += 1
-                    
-                    if value:
-                        headers = list(value[0].keys())
-                        # Add headers
-                        for col, header in enumerate(headers, 1):
-                            cell = ws.cell(row=current_row, column=col, value=header)
-                            cell.font = Font(bold=True)
-                            cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+
+                    # Add data rows
+                    for row in df.itertuples(index=False, name=None):
+                        for col, cell in enumerate(row):
+                            write(current_row, col, cell)
                         current_row += 1
-                        
-                        # Add data rows
-                        for item in value:
-                            for col, header in enumerate(headers, 1):
-                                ws.cell(row=current_row, column=col, value=str(item.get(header, '')))
-                            current_row += 1
-                        current_row += 1  # Add space between sections
+                    current_row += 1  # Add space between sections
                 else:
                     # Simple list
-                    ws[f'A{current_row}'] = key.title()
-                    ws[f'A{current_row}'].font = header_font
-                    ws[f'A{current_row}'].fill = header_fill
-                    current_row += 1
                     for item in value:
-                        ws[f'A{current_row}'] = str(item)
+                        write(current_row, 0, str(item))
                         current_row += 1
                     current_row += 1
             else:
                 # Simple key-value pair
-                ws[f'A{current_row}'] = key.title()
-                ws[f'B{current_row}'] = str(value)
+                write(current_row, 0, key.title())
+                write(current_row, 1, str(value))
                 current_row += 1
-        
+
         return current_row
-    
+
     async def _generate_text(
-        self, 
-        data: Dict[str, Any], 
-        prompt: str, 
-        timestamp: str, 
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
+        unique_id: str
+    ) -> Tuple[str, str]:
+        """Generate text file in a worker thread."""
+        return await asyncio.to_thread(
+            self._build_text_sync, data, prompt, timestamp, unique_id
+        )
+
+    def _build_text_sync(
+        self,
+        data: Dict[str, Any],
+        prompt: str,
+        timestamp: str,
         unique_id: str
     ) -> Tuple[str, str]:
-        """Generate text file."""
+        """Build the text file synchronously."""
         filename = f"scrape_result_{timestamp}_{unique_id}.txt"
         filepath = self.output_dir / filename
-        
-        content = []
-        content.append("=" * 50)
-        content.append("WEB SCRAPING RESULTS")
-        content.append("=" * 50)
-        content.append("")
-        content.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        content.append(f"Prompt: {prompt}")
-        content.append("")
-        content.append("EXTRACTED DATA:")
-        content.append("-" * 20)
-        content.append("")
-        
-        if isinstance(data, dict):
-            content.extend(self._format_dict_for_text(data))
-        else:
-            content.append(str(data))
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
-        
+
+        header = (
+            f"{'=' * 50}\n"
+            "WEB SCRAPING RESULTS\n"
+            f"{'=' * 50}\n"
+            "\n"
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Prompt: {prompt}\n"
+            "\n"
+            "EXTRACTED DATA:\n"
+            f"{'-' * 20}\n"
+            "\n"
+        )
+
+        # Stream lines straight to the (1MB-buffered) file instead of
+        # accumulating them in a list and joining — peak memory stays at
+        # one line regardless of payload size
+        tmp = filepath.with_suffix(filepath.suffix + '.tmp')
+        with open(tmp, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(header)
+            if isinstance(data, dict):
+                f.writelines(self._iter_dict_for_text(data))
+            else:
+                f.write(str(data))
+        os.replace(tmp, filepath)
+
         logger.info(f"Generated text file: {filename}")
         return filename, str(filepath)
-    
-    def _format_dict_for_text(self, data: Dict[str, Any], indent: int = 0) -> list:
-        """Format dictionary data for text output."""
-        lines = []
-        indent_str = "  " * indent
-        
-        for key, value in data.items():
-            if isinstance(value, dict):
-                lines.append(f"{indent_str}{key.upper()}:")
-                lines.extend(self._format_dict_for_text(value, indent + 1))
-                lines.append("")
-            elif isinstance(value, list):
-                lines.append(f"{indent_str}{key.upper()}:")
-                for i, item in enumerate(value, 1):
-                    if isinstance(item, dict):
-                        lines.append(f"{indent_str}  {i}.")
-                        lines.extend(self._format_dict_for_text(item, indent + 2))
-                    else:
-                        lines.append(f"{indent_str}  {i}. {item}")
-                lines.append("")
+
+    def _iter_text_dict(self, key, value, indent: int):
+        yield f"{_INDENT_SPACES[min(indent, 63)]}{key.upper()}:\n"
+        yield from self._iter_dict_for_text(value, indent + 1)
+        yield "\n"
+
+    def _iter_text_list(self, key, value, indent: int):
+        indent_str = _INDENT_SPACES[min(indent, 63)]
+        yield f"{indent_str}{key.upper()}:\n"
+        for i, item in enumerate(value, 1):
+            if type(item) is dict:
+                yield f"{indent_str}  {i}.\n"
+                yield from self._iter_dict_for_text(item, indent + 2)
             else:
-                lines.append(f"{indent_str}{key}: {value}")
-        
-        return lines
+                yield f"{indent_str}  {i}. {item}\n"
+        yield "\n"
+
+    def _iter_text_scalar(self, key, value, indent: int):
+        yield f"{_INDENT_SPACES[min(indent, 63)]}{key}: {value}\n"
+
+    _TEXT_HANDLERS = {dict: _iter_text_dict, list: _iter_text_list}
+
+    def _iter_dict_for_text(self, data: Dict[str, Any], indent: int = 0):
+        """Yield newline-terminated lines of dictionary data for text output."""
+        handlers = self._TEXT_HANDLERS
+        for key, value in data.items():
+            handler = handlers.get(type(value), OutputService._iter_text_scalar)
+            yield from handler(self, key, value, indent)
     
     def cleanup_old_files(self, days: int = 7):
         """Clean up old output files."""
         try:
             import time
-            current_time = time.time()
-            for file_path in self.output_dir.glob("*"):
-                if file_path.is_file():
-                    file_age = current_time - file_path.stat().st_mtime
-                    if file_age > (days * 24 * 3600):  # Convert days to seconds
-                        file_path.unlink()
-                        logger.info(f"Cleaned up old file: {file_path.name}")
+            cutoff = time.time() - days * 86400
+            # scandir serves is_file/stat from the single directory read,
+            # so each entry costs one syscall instead of three
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    # Skip dotfiles (e.g. .gitkeep), which glob("*")
+                    # never matched
+                    if (
+                        not entry.name.startswith('.')
+                        and entry.is_file(follow_symlinks=False)
+                        and entry.stat(follow_symlinks=False).st_mtime < cutoff
+                    ):
+                        os.unlink(entry.path)
+                        logger.info(f"Cleaned up old file: {entry.name}")
         except Exception as e:
             logger.error(f"Error cleaning up files: {str(e)}")
@@ -3,12 +3,37 @@ Web scraping service for fetching and cleaning web content.
 """
 
 import re
-from typing import Tuple
+from typing import Union
+
 import httpx
-from bs4 import BeautifulSoup
+from async_lru import alru_cache
+from selectolax.parser import HTMLParser
 from app.utils.config import settings
 from app.utils.logger import logger
 
+# Compiled once; the fallback cleaner runs this on every failed parse
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Disallowed URL patterns folded into one regex so validation costs a
+# single engine invocation
+_INVALID_URL_RE = re.compile(r'localhost:\d+|127\.0\.0\.1|file://')
+
+# Browser-like request headers, shared across fetches
+_DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    ),
+    "Accept": (
+        "text/html,application/xhtml+xml,application/xml;"
+        "q=0.9,image/webp,*/*;q=0.8"
+    ),
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
 
 class ScraperService:
     """Service for fetching and processing web content."""
@@ -16,55 +41,64 @@ class ScraperService:
     def __init__(self):
         self.timeout = settings.request_timeout
         self.max_content_length = settings.max_content_length
+        # One pooled client for the service's lifetime, so repeat fetches
+        # reuse keep-alive sockets instead of re-handshaking per URL
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64
+            ),
+            headers=_DEFAULT_HEADERS
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called on application shutdown)."""
+        await self._client.aclose()
         
-    async def fetch_content(self, url: str) -> Tuple[str, str]:
+    async def fetch_content(self, url: str) -> str:
         """
         Fetch and clean content from a web URL.
-        
+
+        Repeat fetches of the same URL within the configured TTL are
+        served from an in-process LRU cache, skipping both the network
+        round-trip and the HTML parse.
+
         Args:
             url: Target URL to scrape
-            
+
         Returns:
-            Tuple of (raw_html, cleaned_text)
-            
+            Cleaned text content
+
         Raises:
             Exception: If fetching fails
         """
+        return await self._fetch_cached(url)
+
+    @alru_cache(maxsize=256, ttl=settings.scrape_cache_ttl)
+    async def _fetch_cached(self, url: str) -> str:
+        """Fetch, clean and cache content for one URL."""
         try:
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/91.0.4472.124 Safari/537.36"
-                ),
-                "Accept": (
-                    "text/html,application/xhtml+xml,application/xml;"
-                    "q=0.9,image/webp,*/*;q=0.8"
-                ),
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-            }
-            
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=True
-            ) as client:
-                logger.info(f"Fetching content from: {url}")
-                response = await client.get(url, headers=headers)
+            logger.info(f"Fetching content from: {url}")
+            # Read the body as bytes and let lexbor handle encoding
+            # detection; response.text would decode the whole page into
+            # a second full-size str copy first
+            async with self._client.stream('GET', url) as response:
                 response.raise_for_status()
-                
-                raw_html = response.text
-                cleaned_text = self._clean_html_content(raw_html)
-                
-                # Truncate if too long
-                if len(cleaned_text) > self.max_content_length:
-                    cleaned_text = cleaned_text[:self.max_content_length] + "..."
-                    logger.warning(f"Content truncated to {self.max_content_length} characters")
-                
-                logger.info(f"Successfully fetched {len(cleaned_text)} characters of content")
-                return raw_html, cleaned_text
-                
+                raw_html = await response.aread()
+
+            cleaned_text = self._clean_html_content(raw_html)
+
+            # Truncate if too long
+            if len(cleaned_text) > self.max_content_length:
+                cleaned_text = cleaned_text[:self.max_content_length] + "..."
+                logger.warning(f"Content truncated to {self.max_content_length} characters")
+
+            logger.info(f"Successfully fetched {len(cleaned_text)} characters of content")
+            return cleaned_text
+
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error fetching {url}: {e.response.status_code}")
             raise Exception(f"Failed to fetch URL: HTTP {e.response.status_code}")
@@ -75,43 +109,46 @@ class ScraperService:
             logger.error(f"Error fetching {url}: {str(e)}")
             raise Exception(f"Failed to fetch content: {str(e)}")
     
-    def _clean_html_content(self, html: str) -> str:
+    def _clean_html_content(self, html: Union[str, bytes]) -> str:
         """
         Clean HTML content and extract readable text.
-        
+
         Args:
-            html: Raw HTML content
-            
+            html: Raw HTML content (bytes are parsed as-is, with the
+                encoding detected by lexbor)
+
         Returns:
             Cleaned text content
         """
         try:
-            # Parse HTML
-            soup = BeautifulSoup(html, 'lxml')
-            
-            # Remove script and style elements
-            for element in soup(["script", "style", "meta", "link", "noscript"]):
-                element.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text)
-            
-            return text.strip()
-            
+            # The text output is capped at max_content_length anyway, so
+            # parsing a page vastly larger than that is wasted work;
+            # slice huge documents at a late tag boundary first
+            parse_limit = self.max_content_length * 20
+            if len(html) > parse_limit:
+                markers = (b'</p>', b'</div>') if isinstance(html, bytes) else ('</p>', '</div>')
+                cut = max(html.rfind(marker, 0, parse_limit) for marker in markers)
+                html = html[:cut] if cut > 0 else html[:parse_limit]
+                logger.warning(
+                    f"HTML truncated to {len(html)} of {parse_limit}+ bytes before parsing"
+                )
+
+            # lexbor parses in C and never materializes nodes as Python
+            # objects, so this stays fast and flat-memory on large pages
+            tree = HTMLParser(html)
+            tree.strip_tags(["script", "style", "meta", "link", "noscript"])
+            text = tree.body.text(separator=' ', strip=True) if tree.body else ''
+
+            # split() tokenizes on any whitespace run in one C pass, so
+            # join+split collapses and strips without the regex engine
+            return ' '.join(text.split())
+
         except Exception as e:
             logger.error(f"Error cleaning HTML content: {str(e)}")
             # Fallback: return raw text with basic cleaning
-            text = re.sub(r'<[^>]+>', '', html)
-            text = re.sub(r'\s+', ' ', text)
-            return text.strip()
+            if isinstance(html, bytes):
+                html = html.decode('utf-8', errors='replace')
+            return ' '.join(_TAG_RE.sub('', html).split())
     
     def validate_url(self, url: str) -> bool:
         """
@@ -128,18 +165,9 @@ class ScraperService:
             if not url.startswith(('http://', 'https://')):
                 return False
             
-            # Check for common invalid patterns
-            invalid_patterns = [
-                r'localhost:\d+',  # Localhost URLs
-                r'127\.0\.0\.1',   # Local IP
-                r'file://',        # File URLs
-            ]
-            
-            for pattern in invalid_patterns:
-                if re.search(pattern, url):
-                    return False
-            
-            return True
+            # Check for common invalid patterns (localhost, local IPs,
+            # file URLs)
+            return _INVALID_URL_RE.search(url) is None
             
         except Exception:
             return False
@@ -3,15 +3,16 @@ Configuration settings for the AI Web Scraper application.
 """
 
 import os
+from functools import lru_cache
 from typing import List
-from pydantic import Field, ConfigDict
-from pydantic_settings import BaseSettings
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
-    model_config = ConfigDict(env_file=".env", case_sensitive=False)
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, frozen=True)
     
     # API Configuration
     api_host: str = Field(default="localhost")
@@ -34,6 +35,28 @@ class Settings(BaseSettings):
     max_content_length: int = Field(default=100000)
     request_timeout: int = Field(default=30)
 
+    # Maintenance Configuration
+    cleanup_interval: int = Field(default=300)
+
+    # Caching Configuration
+    scrape_cache_ttl: int = Field(default=300)
+    llm_cache_ttl: int = Field(default=3600)
+    llm_cache_backend: str = Field(default="memory")  # "memory" or "redis"
+    redis_url: str = Field(default="redis://localhost:6379/0")
+
+    # LLM Batching Configuration
+    llm_batch_size: int = Field(default=8)
+    llm_batch_window: float = Field(default=0.025)
+
+    # Batch Endpoint Configuration
+    batch_concurrency: int = Field(default=5)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the memoized Settings instance (FastAPI dependency idiom)."""
+    return Settings()
+
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -2,10 +2,18 @@
 Logging configuration for the AI Web Scraper application.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+_DEFAULT_FORMAT = (
+    "{asctime} - {name} - {levelname} - "
+    "{filename}:{lineno} - {message}"
+)
+
 
 def setup_logger(
     name: str = "ai_webscraper",
@@ -14,40 +22,63 @@ def setup_logger(
 ) -> logging.Logger:
     """
     Set up and configure a logger for the application.
-    
+
+    Records are pushed onto a queue and formatted/written by a
+    background listener thread, so request threads never block on the
+    handler lock or on stdout I/O.
+
     Args:
         name: Logger name
         level: Logging level
-        format_string: Custom format string for log messages
-    
+        format_string: Custom format string for log messages ({-style)
+
     Returns:
         Configured logger instance
     """
     if format_string is None:
-        format_string = (
-            "%(asctime)s - %(name)s - %(levelname)s - "
-            "%(filename)s:%(lineno)d - %(message)s"
-        )
-    
+        format_string = _DEFAULT_FORMAT
+
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     # Avoid duplicate handlers
     if not logger.handlers:
-        # Create console handler
+        # Formatting and writing happen on the listener thread
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(level)
-        
-        # Create formatter
-        formatter = logging.Formatter(format_string)
-        console_handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        logger.addHandler(console_handler)
-    
+        console_handler.setFormatter(logging.Formatter(format_string, style='{'))
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(
+            log_queue, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+
+        logger.addHandler(QueueHandler(log_queue))
+
     return logger
 
 
+def setup_worker_logger(name: str = "ai_webscraper") -> None:
+    """
+    Reconfigure logging inside a forked worker process.
+
+    Children inherit the QueueHandler and its queue, but not the
+    listener thread that drains it, so their records would be enqueued
+    and never written. Replace the inherited handlers with a direct
+    StreamHandler; workers log rarely enough that the synchronous write
+    doesn't matter there.
+    """
+    worker_logger = logging.getLogger(name)
+    for handler in worker_logger.handlers[:]:
+        worker_logger.removeHandler(handler)
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(_DEFAULT_FORMAT, style='{'))
+    worker_logger.addHandler(console_handler)
+
+
 # Global logger instance
 logger = setup_logger()
@@ -0,0 +1,151 @@
+"""
+Shared fixtures for the API test suite.
+"""
+
+import copy
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.endpoints import scrape as scrape_ep
+from app.api.endpoints import status as status_ep
+
+# Minimal app holding just the routers under test. Building app.main's
+# application would add CORS/GZip middleware, the docs routes, and the
+# static outputs mount, none of which these tests drive; its custom
+# exception handlers are likewise not needed because error branches are
+# tested by calling the endpoint coroutines directly.
+test_app = FastAPI()
+test_app.include_router(scrape_ep.router, prefix="/api")
+test_app.include_router(status_ep.router, prefix="/api")
+
+def areturn(value):
+    """Plain async stub returning ``value``.
+
+    Cheaper than AsyncMock when a test only needs the awaited result and
+    never asserts on calls.
+    """
+    async def _stub(*args, **kwargs):
+        return value
+    return _stub
+
+
+def araise(exc):
+    """Plain async stub raising ``exc``."""
+    async def _stub(*args, **kwargs):
+        raise exc
+    return _stub
+
+
+# Service stub templates, built once: MagicMock construction is the
+# dominant per-test cost in mock-heavy suites. Async methods are plain
+# closures, not AsyncMock -- no test asserts on their calls. Tests
+# receive a shallow copy and *assign* new attributes to deviate from the
+# defaults (assignment stays local to the copy; mutating a template
+# child mock's return_value would leak into other tests).
+_SCRAPER_TEMPLATE = MagicMock()
+_SCRAPER_TEMPLATE.validate_url.return_value = True
+_SCRAPER_TEMPLATE.fetch_content = areturn("cleaned_content")
+
+_LLM_TEMPLATE = MagicMock()
+_LLM_TEMPLATE.process_content = areturn(
+    {"title": "Test Page", "content": "Test content"}
+)
+_LLM_TEMPLATE.check_availability = areturn(True)
+_LLM_TEMPLATE.cache.stats = {"hits": 0, "misses": 0}
+
+_OUTPUT_TEMPLATE = MagicMock()
+_OUTPUT_TEMPLATE.generate_output = areturn(
+    ("test_output.txt", "/path/to/test_output.txt")
+)
+
+
+def _copy_mock(template: MagicMock) -> MagicMock:
+    """Shallow-copy a mock with its own child registry.
+
+    copy.copy alone shares _mock_children between template and copy, so
+    even attribute assignment on the copy would bleed back into the
+    template; giving the copy its own registry keeps assignments local.
+    """
+    clone = copy.copy(template)
+    clone.__dict__['_mock_children'] = dict(template.__dict__['_mock_children'])
+    return clone
+
+
+@pytest.fixture
+def scraper_mock():
+    return _copy_mock(_SCRAPER_TEMPLATE)
+
+
+@pytest.fixture
+def llm_mock():
+    return _copy_mock(_LLM_TEMPLATE)
+
+
+@pytest.fixture
+def output_mock():
+    return _copy_mock(_OUTPUT_TEMPLATE)
+
+
+@pytest.fixture(autouse=True)
+def _stub_cleanup(monkeypatch):
+    """Keep cleanup_old_files inert for every test.
+
+    The real implementation scans the outputs directory and deletes by
+    mtime; no test asserts on it, and nothing here should touch real
+    output files as a side effect.
+    """
+    monkeypatch.setattr(
+        scrape_ep.output_service, "cleanup_old_files",
+        lambda *args, **kwargs: None, raising=False,
+    )
+
+
+@pytest.fixture(scope="class")
+def _class_patch():
+    """One MonkeyPatch per test class.
+
+    The built-in monkeypatch fixture is function-scoped, so it records
+    and restores the original service attributes for every test; a
+    class-wide patch does that bookkeeping once per class. Tests still
+    stay isolated because `services` swaps in fresh mock copies each
+    test.
+    """
+    mp = pytest.MonkeyPatch()
+    yield mp
+    mp.undo()
+
+
+@pytest.fixture
+def services(_class_patch, scraper_mock, llm_mock, output_mock):
+    """Install all three service stubs in one swap.
+
+    Returns a namespace so tests configure behaviour through one object
+    (``services.llm.process_content = ...``) instead of stacking three
+    separate patches per test.
+    """
+    s = SimpleNamespace(scraper=scraper_mock, llm=llm_mock, output=output_mock)
+    _class_patch.setattr(scrape_ep, "scraper_service", s.scraper)
+    _class_patch.setattr(scrape_ep, "llm_service", s.llm)
+    _class_patch.setattr(scrape_ep, "output_service", s.output)
+    _class_patch.setattr(status_ep, "llm_service", s.llm)
+    return s
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """One ASGI-backed HTTP client shared by the whole session.
+
+    Rebuilding the transport and client per test dominated runtime for
+    these short requests; the transport is stateless, so sharing it is
+    safe. ASGITransport also never runs the app's lifespan, so tests
+    skip service construction and the cleanup task entirely -- every
+    service a route touches is monkeypatched per test instead.
+    """
+    transport = ASGITransport(app=test_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
@@ -0,0 +1,65 @@
+"""
+Tests for the LLM request batcher.
+"""
+
+import asyncio
+import pytest
+from app.services.llm_batcher import LLMBatcher
+
+
+@pytest.mark.asyncio
+async def test_single_request_passes_through():
+    """A lone request is forwarded with its original prompt."""
+    calls = []
+
+    async def fake_process(content, prompt):
+        calls.append((content, prompt))
+        return {"title": "Test"}
+
+    batcher = LLMBatcher(fake_process, max_queue_time=0.01)
+    result = await batcher.process("some content", "Extract the title")
+    await batcher.stop()
+
+    assert result == {"title": "Test"}
+    assert calls == [("some content", "Extract the title")]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched():
+    """Concurrent requests share one LLM call and get their own slice."""
+    calls = []
+
+    async def fake_process(content, prompt, **kwargs):
+        calls.append((content, prompt))
+        return {"1": {"item": "a"}, "2": {"item": "b"}}
+
+    batcher = LLMBatcher(fake_process, max_queue_time=0.05)
+    results = await asyncio.gather(
+        batcher.process("content a", "prompt a"),
+        batcher.process("content b", "prompt b"),
+    )
+    await batcher.stop()
+
+    assert len(calls) == 1
+    assert results == [{"item": "a"}, {"item": "b"}]
+
+
+@pytest.mark.asyncio
+async def test_malformed_batch_response_fails_waiters():
+    """Waiters fail when the model drops the numbered structure.
+
+    Resolving them with the combined response would leak one request's
+    data into another's result.
+    """
+    async def fake_process(content, prompt, **kwargs):
+        return {"wrong": "shape"}
+
+    batcher = LLMBatcher(fake_process, max_queue_time=0.05)
+    results = await asyncio.gather(
+        batcher.process("content a", "prompt a"),
+        batcher.process("content b", "prompt b"),
+        return_exceptions=True,
+    )
+    await batcher.stop()
+
+    assert all(isinstance(r, Exception) for r in results)
@@ -0,0 +1,48 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.services.llm_cache import InMemoryCacheBackend, LLMCache
+from app.services.llm_service import LLMService
+
+
+def test_make_key_varies_with_inputs():
+    """Different provider/model/prompt/content produce different keys."""
+    base = LLMCache.make_key("openai", "gpt-3.5-turbo", "prompt", "content")
+
+    assert base == LLMCache.make_key("openai", "gpt-3.5-turbo", "prompt", "content")
+    assert base != LLMCache.make_key("openrouter", "gpt-3.5-turbo", "prompt", "content")
+    assert base != LLMCache.make_key("openai", "gpt-4", "prompt", "content")
+    assert base != LLMCache.make_key("openai", "gpt-3.5-turbo", "other prompt", "content")
+    assert base != LLMCache.make_key("openai", "gpt-3.5-turbo", "prompt", "other content")
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_provider_call():
+    """A repeated request is served from the cache without an API call."""
+    service = LLMService()
+    service._process_with_openai = AsyncMock(return_value={"title": "Cached"})
+    service.provider = "openai"
+
+    first = await service.process_content("page content", "Extract the title")
+    second = await service.process_content("page content", "Extract the title")
+
+    assert first == second == {"title": "Cached"}
+    assert service._process_with_openai.call_count == 1
+    assert service.cache.stats == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    """Cached values become unavailable once their TTL elapses."""
+    cache = LLMCache(backend=InMemoryCacheBackend(ttl=0.05))
+    key = LLMCache.make_key("openai", "gpt-3.5-turbo", "prompt", "content")
+
+    await cache.set(key, {"title": "Test"})
+    assert await cache.get(key) == {"title": "Test"}
+
+    await asyncio.sleep(0.1)
+    assert await cache.get(key) is None
@@ -0,0 +1,56 @@
+"""
+Tests for the LLM service health check.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.llm_service import LLMService
+
+
+def _client_returning(status_code):
+    """Fake HTTP client whose get() counts calls and returns a status."""
+    client = MagicMock()
+    client.calls = 0
+
+    async def get(*args, **kwargs):
+        client.calls += 1
+        return SimpleNamespace(status_code=status_code)
+
+    client.get = get
+    return client
+
+
+@pytest.mark.asyncio
+async def test_check_availability_probes_provider():
+    """A 200 from the provider's /models endpoint reports available."""
+    service = LLMService(client=_client_returning(200))
+
+    assert await service.check_availability() is True
+
+
+@pytest.mark.asyncio
+async def test_check_availability_result_is_cached():
+    """Repeated checks within the TTL reuse the last probe result."""
+    client = _client_returning(200)
+    service = LLMService(client=client)
+
+    assert await service.check_availability() is True
+    assert await service.check_availability() is True
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_check_availability_handles_provider_failure():
+    """A connection failure reports unavailable instead of raising."""
+    client = MagicMock()
+
+    async def get(*args, **kwargs):
+        raise RuntimeError("connection refused")
+
+    client.get = get
+    service = LLMService(client=client)
+
+    assert await service.check_availability() is False
@@ -3,83 +3,67 @@ Tests for status endpoints.
 """
 
 import pytest
-from httpx import AsyncClient
-from unittest.mock import patch, AsyncMock
-from app.main import app
+from fastapi import HTTPException
+
+from app.api.endpoints import status as status_ep
+from app import main
+from tests.conftest import araise, areturn
 
 
 @pytest.mark.asyncio
 class TestStatusEndpoint:
     """Test cases for the status endpoint."""
-    
-    async def test_status_success(self):
+
+    async def test_status_success(self, client, services):
         """Test successful status check."""
-        with patch('app.api.endpoints.status.llm_service') as mock_llm:
-            mock_llm.check_availability = AsyncMock(return_value=True)
-            
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.get("/api/status")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "healthy"
-            assert data["llm_available"] is True
-            assert "llm_provider" in data
-            assert "version" in data
-    
-    async def test_status_llm_unavailable(self):
+        response = await client.get("/api/status")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert data["llm_available"] is True
+        assert "llm_provider" in data
+        assert "version" in data
+
+    async def test_status_llm_unavailable(self, client, services):
         """Test status when LLM service is unavailable."""
-        with patch('app.api.endpoints.status.llm_service') as mock_llm:
-            mock_llm.check_availability = AsyncMock(return_value=False)
-            
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.get("/api/status")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "healthy"
-            assert data["llm_available"] is False
-    
-    async def test_status_service_error(self):
-        """Test status when service check fails."""
-        with patch('app.api.endpoints.status.llm_service') as mock_llm:
-            mock_llm.check_availability = AsyncMock(side_effect=Exception("Service error"))
-            
-            async with AsyncClient(app=app, base_url="http://test") as client:
-                response = await client.get("/api/status")
-            
-            assert response.status_code == 500
-            data = response.json()
-            assert "Service error" in data["detail"]
+        services.llm.check_availability = areturn(False)
 
+        response = await client.get("/api/status")
 
-@pytest.mark.asyncio
-class TestHealthEndpoint:
-    """Test cases for the health endpoint."""
-    
-    async def test_health_check(self):
-        """Test basic health check."""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.get("/api/health")
-        
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
-        assert "message" in data
+        assert data["llm_available"] is False
+
+    async def test_status_service_error(self, services):
+        """Test status when service check fails.
+
+        Calls the endpoint coroutine directly; only its error branch is
+        under test, and test_status_success covers the full stack.
+        """
+        services.llm.check_availability = araise(Exception("Service error"))
+
+        with pytest.raises(HTTPException) as exc:
+            await status_ep.get_status()
+
+        assert exc.value.status_code == 500
+        assert "Service error" in exc.value.detail
 
 
 @pytest.mark.asyncio
-class TestRootEndpoint:
-    """Test cases for the root endpoint."""
-    
-    async def test_root_endpoint(self):
-        """Test root endpoint returns API information."""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.get("/")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "version" in data
-        assert "docs" in data
-        assert "status" in data
+@pytest.mark.parametrize(
+    "handler,keys",
+    [
+        (status_ep.health_check, {"status", "message"}),
+        (main.root, {"message", "version", "docs", "status"}),
+    ],
+    ids=["health", "root"],
+)
+async def test_static_endpoints(handler, keys):
+    """Test the static health and root endpoints in one pass.
+
+    These handlers return plain dicts, so call them directly instead of
+    driving the whole ASGI stack.
+    """
+    assert keys <= (await handler()).keys()